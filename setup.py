@@ -14,6 +14,10 @@ setup(
         "requests-async>=0.2.0",
         "requests-cache>=0.4.13",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "brotli": ["brotli"],
+    },
     description="Wrapper around Cryptocurrency related APIs",
     py_modules=["cryptowrapper"],
     package_dir={"": "src"},
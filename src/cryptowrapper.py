@@ -1,21 +1,268 @@
 import logging
 import asyncio
 import os
-import re
 import json
 import tempfile
 import hmac
+import random
+import threading
+import weakref
 from hashlib import sha256, sha384
-from uuid import uuid4
-from urllib.parse import urlparse
-from time import time, sleep
-from inspect import getmembers, ismethod
+from itertools import count
+from datetime import datetime, timedelta
+from time import time, sleep, monotonic
+from contextlib import contextmanager
+
+try:
+    # Optional, faster (de)serialization straight from/to bytes
+    from orjson import loads as _json_loads, dumps as _json_dumps
+except ImportError:
+    from json import loads as _json_loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+try:
+    # Optional, brotli compressed responses (decoded by urllib3)
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+from requests import Request, Session as SyncSession
+from requests.adapters import HTTPAdapter
+# requests_cache / requests_async: imported on session creation
+
+
+_COMMON_HEADERS = {
+    "Accept": "application/json", "Accept-Encoding": _ACCEPT_ENCODING
+}
+_BINANCE_DEX_HEADERS = {**_COMMON_HEADERS, "Content-Type": "text/plain"}
+# Errors returned as-is (Bad request, Denied, Not found, Rate limit...)
+_NO_RETRY_STATUSES = frozenset((400, 401, 403, 404, 429, 500))
+# Deribit nonces: one counter for all instances, time seeded at import
+_DERIBIT_NONCES = count(int(time() * 1e6))
+
+
+def _backoff(retry_time, attempt, max_backoff=60):
+    '''Delay (seconds) before a retry attempt: random between 0 and an
+    interval doubled on each attempt, up to max_backoff (full jitter)
+    '''
+    return random.uniform(0, min(retry_time * 2 ** (attempt - 1), max_backoff))
+
+
+class _SharedHTTPAdapter(HTTPAdapter):
+    '''HTTPAdapter mounted on several sessions
+
+    Owned by the module, not by any session: Session.close() would clear
+    the pool of every other wrapper, so close() is a no-op and the pool
+    lives until the process exits.
+    '''
+    def close(self):
+        pass
+
+
+_HTTP_ADAPTER = None
+_HTTP_ADAPTER_LOCK = threading.Lock()
+
+
+def _http_adapter():
+    '''Keep-alive pool shared by the (sync) sessions of all wrappers'''
+    global _HTTP_ADAPTER
+    with _HTTP_ADAPTER_LOCK:
+        if _HTTP_ADAPTER is None:
+            _HTTP_ADAPTER = _SharedHTTPAdapter(
+                pool_connections=10, pool_maxsize=20
+            )
+
+        return _HTTP_ADAPTER
+
+
+# Directory of the requests-cache files, resolved once at import
+_CACHE_DIR = tempfile.gettempdir()
+
+_CLEANUP_INTERVAL = 900
+_CLEANED_FILES = set()
+_CLEANED_FILES_LOCK = threading.Lock()
+
+
+def _schedule_cleanup(cache, expire_after):
+    '''Purge the expired responses of a requests-cache every 15 minutes,
+    while the cache is in use (daemon timer). sqlite files are also
+    switched to incremental auto-vacuum and reclaimed (once per file).
+
+    Params:
+        cache: requests_cache BaseCache (sqlite or memory backend)
+        expire_after: int (seconds)
+            Age of the purged responses (first session of the file).
+    '''
+    # None for the in-memory backend
+    filename = getattr(cache.responses, "filename", None)
+    if filename is not None:
+        with _CLEANED_FILES_LOCK:
+            if filename in _CLEANED_FILES:
+                return
+
+            _CLEANED_FILES.add(filename)
+
+        with cache.responses.connection() as con:
+            if con.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # Only takes effect on existing files after a full VACUUM
+                con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                con.execute("VACUUM")
+
+    # The timer must not keep a closed session's cache alive
+    cache_ref = weakref.ref(cache)
+
+    def _cleanup():
+        cache = cache_ref()
+        if cache is None:
+            # Left to the next session created on the file
+            with _CLEANED_FILES_LOCK:
+                _CLEANED_FILES.discard(filename)
+            return
+
+        try:
+            # Otherwise only dropped when requested again
+            cache.remove_old_entries(
+                datetime.utcnow() - timedelta(seconds=expire_after)
+            )
+            if filename is not None:
+                with cache.responses.connection(True) as con:
+                    con.execute("PRAGMA incremental_vacuum(128000)")
+
+        except Exception as e:
+            logging.getLogger("CryptoWrapper").info("Exception: %s", e)
+
+        timer = threading.Timer(_CLEANUP_INTERVAL, _cleanup)
+        timer.daemon = True
+        timer.start()
+
+    _cleanup()
+
+
+def _log_deletion(obj, logger):
+    '''Debug log obj's deletion, through a finalizer rather than __del__
+    (not run at interpreter exit)
+    '''
+    if logger.isEnabledFor(logging.DEBUG):
+        finalizer = weakref.finalize(
+            obj, logger.debug, "Deleting %s", repr(obj)
+        )
+        finalizer.atexit = False
 
-from requests import Request
-from requests_cache.core import CachedSession
-from requests_async import Session
 
+def _endpoint_verb(function_name):
+    '''HTTP verb from an endpoint function name suffix (default: GET)'''
+    verb = function_name.rsplit("_", 1)[-1]
+    return verb if verb in ("GET", "POST", "PUT", "DELETE") else "GET"
 
+
+def _bind_endpoints(cls):
+    '''Class decorator creating the endpoint methods, once per class'''
+    for function_name, endpoint in cls._FUNCTIONS_ENDPOINTS.items():
+        verb = _endpoint_verb(function_name)
+        cls._create_class_function(function_name, endpoint, verb)
+
+    return cls
+
+
+class _TokenBucket:
+    '''Token bucket pre-throttling requests to `rate` per `period` seconds
+
+    Drained early when a response reports no remaining rate limit.
+    '''
+    def __init__(self, rate: int, period: float = 60):
+        self.rate = rate
+        self.period = period
+        self._tokens = rate
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        '''Take a token, return the wait (seconds) until it is available'''
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.rate,
+                self._tokens + (now - self._updated) * self.rate / self.period
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+
+            return -self._tokens * self.period / self.rate
+
+    def acquire(self):
+        delay = self._take()
+        if delay:
+            sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._take()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def update(self, response_object):
+        '''Drain the bucket when the rate limit headers report none left'''
+        headers = response_object.headers
+        remaining = headers.get("RateLimit-Remaining") \
+            or headers.get("X-RateLimit-Remaining")
+        if remaining == "0" or response_object.status_code == 429:
+            with self._lock:
+                self._tokens = min(self._tokens, 0)
+
+
+class _AIMDLimiter:
+    '''Concurrency limit for async requests, raised additively on success
+    and halved on rate limits / server errors (AIMD)
+    '''
+    def __init__(self, limit: float = 4, min_limit: float = 1,
+                 max_limit: float = 32, increase: float = 0.5,
+                 decrease: float = 0.5):
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self._in_flight = 0
+        self._blocked_until = 0
+        self._condition = None
+
+    async def __aenter__(self):
+        # Created lazily, within the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        delay = self._blocked_until - monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._in_flight < int(self.limit)
+            )
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def update(self, response_object):
+        '''Adjust the limit from a response status (and Retry-After)'''
+        status_code = response_object.status_code
+        if status_code == 429 or status_code >= 500:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+            retry_after = response_object.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                self._blocked_until = monotonic() + int(retry_after)
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+
+
+@_bind_endpoints
 class CoinMarketCap:
     '''Wrapper for the CoinMarketCap API
 
@@ -26,7 +273,12 @@ class CoinMarketCap:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        max_concurrency: int = 20
+            Maximum requests in flight per instance (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -45,7 +297,7 @@ class CoinMarketCap:
         "tools_price_conversion_GET": "/tools/price-conversion",
         "fcas_listings_latest_GET": "/partners/flipside-crypto/fcas/listings/latest",
         "fcas_quotes_latest_GET": "/partners/flipside-crypto/fcas/quotes/latest",
-        "key_info_GET": "key/info",
+        "key_info_GET": "/key/info",
         # Hobbyist endpoints
         # Startup endpoints
         "cryptocurrency_OHLCV_latest_GET": "/cryptocurrency/ohlcv/latest",
@@ -68,35 +320,38 @@ class CoinMarketCap:
         # Not yet available
         "exchange_listings_historical_GET": "/exchange/listings/historical",
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        if not self.asynchronous:
-            def _endpoint_request(self, **kwargs):
-                response = self._request(endpoint, verb, params=kwargs)
-                return response
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        def _endpoint_request(self, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, params=kwargs)
 
-        else:
-            async def _endpoint_request(self, **kwargs):
-                response = await self._request_async(
-                    endpoint, verb, params=kwargs
-                )
-                return response
+            return self._request(url, verb, params=kwargs)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, request_timeout: int = 10,
                  max_retries: int = 0, retry_time: int = 3,
-                 cache_expire: int = 0):
+                 cache_expire: int = 0,
+                 max_backoff: int = 60, max_concurrency: int = 20):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
@@ -104,138 +359,170 @@ class CoinMarketCap:
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
-
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
-
-            self._create_class_function(function_name, endpoint, verb)
-
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
 
     def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
 
-        return endpoint_methods
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
+
+        return prepped
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
 
             # Cache handling
             if not self.asynchronous:
+                ob = getattr(response_object, "from_cache", False)
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params)
-
+    def _request(self, url, verb, params):
         # Create session
         if not self.session:
-            cache_filename = "coinmarketcap_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
-            self.session = CachedSession(
-                cache_name=filename,
-                backend="sqlite",
-                expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
-            )
-            self.session.headers.update({"X-CMC_PRO_API_KEY": self.api_key})
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "deflate, gzip"})
+            if self.cache_expire:
+                cache_filename = "coinmarketcap_cache"
+                filename = os.path.join(_CACHE_DIR, cache_filename)
+                from requests_cache.core import CachedSession
+                self.session = CachedSession(
+                    cache_name=filename,
+                    backend="sqlite",
+                    expire_after=self.cache_expire,
+                    allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                    fast_save=True
+                )
+                # WAL journal, persisted in the cache file
+                with self.session.cache.responses.connection(True) as con:
+                    con.execute("PRAGMA journal_mode=WAL")
+                _schedule_cleanup(self.session.cache, self.cache_expire)
+            else:
+                # Nothing is ever served from the cache (cache_expire=0)
+                self.session = SyncSession()
+            # Keep-alive pool shared across wrappers
+            self.session.mount("https://", _http_adapter())
+            self.session.headers.update({
+                "X-CMC_PRO_API_KEY": self.api_key,
+                "Accept": "application/json",
+                "Accept-Encoding": _ACCEPT_ENCODING
+            })
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"X-CMC_PRO_API_KEY": self.api_key})
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "deflate, gzip"})
+            self.session.headers.update({
+                "X-CMC_PRO_API_KEY": self.api_key,
+                "Accept": "application/json",
+                "Accept-Encoding": _ACCEPT_ENCODING
+            })
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        if self._semaphore is None:
+            # Created lazily, within the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            async with self._semaphore:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class CryptoCompare:
     '''Wrapper for the CryptoCompare API
 
@@ -246,7 +533,12 @@ class CryptoCompare:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        max_concurrency: int = 20
+            Maximum requests in flight per instance (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -323,35 +615,38 @@ class CryptoCompare:
         "subs_watchlist_GET": "/data/subsWatchlist?",
         "info_coins_GET": "/data/coin/generalinfo?"
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        if not self.asynchronous:
-            def _endpoint_request(self, **kwargs):
-                response = self._request(endpoint, verb, params=kwargs)
-                return response
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        def _endpoint_request(self, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, params=kwargs)
 
-        else:
-            async def _endpoint_request(self, **kwargs):
-                response = await self._request_async(
-                    endpoint, verb, params=kwargs
-                )
-                return response
+            return self._request(url, verb, params=kwargs)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, request_timeout: int = 10,
                  max_retries: int = 0, retry_time: int = 3,
-                 cache_expire: int = 0):
+                 cache_expire: int = 0,
+                 max_backoff: int = 60, max_concurrency: int = 20):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
@@ -359,144 +654,170 @@ class CryptoCompare:
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
-
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
-
-            self._create_class_function(function_name, endpoint, verb)
-
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
 
     def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
+
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-        return endpoint_methods
+        return prepped
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
 
             # Handle cache
             if not self.asynchronous:
+                ob = getattr(response_object, "from_cache", False)
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params)
-
+    def _request(self, url, verb, params):
         # Create session
         if not self.session:
-            cache_filename = "cryptocompare_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
-            self.session = CachedSession(
-                cache_name=filename,
-                backend="sqlite",
-                expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
-            )
-            self.session.headers.update(
-                {"authorization": f"Apikey {self.api_key}"}
-            )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "deflate, gzip"})
+            if self.cache_expire:
+                cache_filename = "cryptocompare_cache"
+                filename = os.path.join(_CACHE_DIR, cache_filename)
+                from requests_cache.core import CachedSession
+                self.session = CachedSession(
+                    cache_name=filename,
+                    backend="sqlite",
+                    expire_after=self.cache_expire,
+                    allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                    fast_save=True
+                )
+                # WAL journal, persisted in the cache file
+                with self.session.cache.responses.connection(True) as con:
+                    con.execute("PRAGMA journal_mode=WAL")
+                _schedule_cleanup(self.session.cache, self.cache_expire)
+            else:
+                # Nothing is ever served from the cache (cache_expire=0)
+                self.session = SyncSession()
+            # Keep-alive pool shared across wrappers
+            self.session.mount("https://", _http_adapter())
+            self.session.headers.update({
+                "authorization": f"Apikey {self.api_key}",
+                "Accept": "application/json",
+                "Accept-Encoding": _ACCEPT_ENCODING
+            })
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        # return
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update(
-                {"authorization": f"Apikey {self.api_key}"}
-            )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "deflate, gzip"})
+            self.session.headers.update({
+                "authorization": f"Apikey {self.api_key}",
+                "Accept": "application/json",
+                "Accept-Encoding": _ACCEPT_ENCODING
+            })
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        # return
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        if self._semaphore is None:
+            # Created lazily, within the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            async with self._semaphore:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class BitMEX:
     '''Wrapper for the BitMEX REST API
 
@@ -508,7 +829,12 @@ class BitMEX:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        max_concurrency: int = 20
+            Maximum requests in flight per instance (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -597,208 +923,249 @@ class BitMEX:
         "user_wallet_summary_GET": "/user/walletSummary",
         "user_event_GET": "/userEvent"
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        if not self.asynchronous:
-            def _endpoint_request(self, **kwargs):
-                response = self._request(endpoint, verb, params=kwargs)
-                return response
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        def _endpoint_request(self, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, params=kwargs)
 
-        else:
-            async def _endpoint_request(self, **kwargs):
-                response = await self._request_async(
-                    endpoint, verb, params=kwargs
-                )
-                return response
+            return self._request(url, verb, params=kwargs)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, api_secret: str = None,
                  request_timeout: int = 10, max_retries: int = 0,
-                 retry_time: int = 3, cache_expire: int = 0):
+                 retry_time: int = 3, cache_expire: int = 0,
+                 max_backoff: int = 60, max_concurrency: int = 20):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed once, copied per signature
+        self._hmac_template = hmac.new(
+            api_secret.encode("utf-8"), digestmod=sha256
+        ) if api_secret else None
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
 
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
-
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
-
-            self._create_class_function(function_name, endpoint, verb)
-
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
 
     def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
-
-        return endpoint_methods
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
 
     def _set_auth_headers(self, prepped):
         '''Set authentication headers on a preppared request'''
         verb = prepped.method
-        parsed_url = urlparse(prepped.url)
-        path = parsed_url.path
-        path = "?".join([path, parsed_url.query]) if parsed_url.query else path
+        path = prepped.path_url
         expires = int(time() + 5)
-        data = prepped.body or ""
+        data = prepped.body or b""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        h = self._hmac_template.copy()
+        h.update(verb.encode("ascii"))
+        h.update(path.encode("ascii"))
+        h.update(str(expires).encode("ascii"))
+        h.update(data)
+        signature = h.hexdigest()
+
+        prepped.headers.update({
+            "api-key": self.api_key,
+            "api-expires": str(expires),
+            "api-signature": signature
+        })
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
 
-        message = verb + path + str(expires) + data
-        signature = hmac.new(
-            key=self.api_secret.encode("utf-8"),
-            msg=message.encode("utf-8"),
-            digestmod=sha256
-        ).hexdigest()
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-        prepped.headers.update({"api-key": self.api_key})
-        prepped.headers.update({"api-expires": str(expires)})
-        prepped.headers.update({"api-signature": str(signature)})
+        return prepped
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
+            headers = response_object.headers
             ratelimit = {"ratelimit": {
-                "limit": response_object.headers["x-ratelimit-limit"],
-                "remaining": response_object.headers["x-ratelimit-remaining"],
-                "reset": response_object.headers["x-ratelimit-reset"]
+                "limit": headers.get("x-ratelimit-limit"),
+                "remaining": headers.get("x-ratelimit-remaining"),
+                "reset": headers.get("x-ratelimit-reset")
             }}
 
             # Cache handling
             if not self.asynchronous:
+                ob = getattr(response_object, "from_cache", False)
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
                     response.append(ratelimit)
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
                     response.update(ratelimit)
 
             else:
-                response = [dict(item) for item in response]
-                response.append(ratelimit)
+                if isinstance(response, list):
+                    response.append(ratelimit)
+
+                if isinstance(response, dict):
+                    response.update(ratelimit)
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params)
-
+    def _request(self, url, verb, params):
         # Create session
         if not self.session:
-            cache_filename = "bitmex_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
-            self.session = CachedSession(
-                cache_name=filename,
-                backend="sqlite",
-                expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
-            )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            if self.cache_expire:
+                cache_filename = "bitmex_cache"
+                filename = os.path.join(_CACHE_DIR, cache_filename)
+                from requests_cache.core import CachedSession
+                self.session = CachedSession(
+                    cache_name=filename,
+                    backend="sqlite",
+                    expire_after=self.cache_expire,
+                    allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                    fast_save=True
+                )
+                # WAL journal, persisted in the cache file
+                with self.session.cache.responses.connection(True) as con:
+                    con.execute("PRAGMA journal_mode=WAL")
+                _schedule_cleanup(self.session.cache, self.cache_expire)
+            else:
+                # Nothing is ever served from the cache (cache_expire=0)
+                self.session = SyncSession()
+            # Keep-alive pool shared across wrappers
+            self.session.mount("https://", _http_adapter())
+            self.session.headers.update(_COMMON_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            if self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            self.session.headers.update(_COMMON_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        if self._semaphore is None:
+            # Created lazily, within the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            if self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            async with self._semaphore:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class Binance:
     '''Wrapper for the Binance REST API
 
@@ -810,7 +1177,12 @@ class Binance:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        max_concurrency: int = 20
+            Maximum requests in flight per instance (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -869,198 +1241,237 @@ class Binance:
         "user_wallet_withdraw_POST": "/wapi/v3/withdraw.html",
         "user_wallet_withdrawal_history_GET": "/wapi/v3/withdrawHistory.html"
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
+    # Endpoints requiring a signature
+    _SIGNED_ENDPOINTS = frozenset(
+        e for e in _FUNCTIONS_ENDPOINTS.values()
+        if e.startswith(("/api/v3/", "/wapi/v3/"))
+    ) - {
+        "/api/v3/avgPrice",
+        "/api/v3/ticker/bookTicker",
+        "/api/v3/ticker/price",
+        "/wapi/v3/systemStatus.html"
+    }
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        if not self.asynchronous:
-            def _endpoint_request(self, **kwargs):
-                response = self._request(endpoint, verb, params=kwargs)
-                return response
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
+        signed = endpoint in cls._SIGNED_ENDPOINTS
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        def _endpoint_request(self, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            # No params (ex: ping_GET): prepared URL reused as is
+            params = kwargs or None
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, params, signed)
 
-        else:
-            async def _endpoint_request(self, **kwargs):
-                response = await self._request_async(
-                    endpoint, verb, params=kwargs
-                )
-                return response
+            return self._request(url, verb, params, signed)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, api_secret: str = None,
                  request_timeout: int = 10, max_retries: int = 0,
-                 retry_time: int = 3, cache_expire: int = 0):
+                 retry_time: int = 3, cache_expire: int = 0,
+                 max_backoff: int = 60, max_concurrency: int = 20):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed once, copied per signature
+        self._hmac_template = hmac.new(
+            api_secret.encode("utf-8"), digestmod=sha256
+        ) if api_secret else None
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
 
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
-
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
 
-            self._create_class_function(function_name, endpoint, verb)
+    def __getfunctions__(self):
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    def _sign(self, prepped):
+        '''Append the signature to a prepared request'''
+        # Sign the query string already encoded by prepare_url
+        query = prepped.url.partition("?")[2]
+        h = self._hmac_template.copy()
+        h.update(query.encode("utf-8"))
+        signature = h.hexdigest()
+        prepped.url += ("&" if query else "?") + "signature=" + signature
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
 
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-    def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
-
-        return endpoint_methods
-
-    def _set_auth(self, prepped):
-        '''Set authentication on a preppared request'''
-        parsed_url = urlparse(prepped.url)
-        path = parsed_url.query if parsed_url.query else ""
-        api = parsed_url.path
-
-        signature = hmac.new(
-            key=self.api_secret.encode("utf-8"),
-            msg=path.encode("utf-8"),
-            digestmod=sha256
-        ).hexdigest()
-
-        prepped.headers.update({"X-MBX-APIKEY": str(self.api_key)})
-        if (("/api/v3" in api or "/wapi/v3" in api)
-                and "/avgPrice" not in api
-                and "/bookTicker" not in api
-                and "/price" not in api
-                and "/systemStatus.html" not in api):
-            params = {"signature": str(signature)}
-            prepped.prepare_url(prepped.url, params=params)
+        return prepped
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
 
             # Cache handling
             if not self.asynchronous:
+                ob = response_object.from_cache
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params)
-
+    def _request(self, url, verb, params, signed=False):
         # Create session
         if not self.session:
             cache_filename = "binance_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
+            filename = os.path.join(_CACHE_DIR, cache_filename)
+            from requests_cache.core import CachedSession
             self.session = CachedSession(
                 cache_name=filename,
                 backend="sqlite",
                 expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
+                allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                fast_save=True
             )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            # WAL journal, persisted in the cache file
+            with self.session.cache.responses.connection(True) as con:
+                con.execute("PRAGMA journal_mode=WAL")
+            if self.cache_expire:
+                _schedule_cleanup(self.session.cache, self.cache_expire)
+            # Keep-alive pool shared across wrappers
+            self.session.mount("https://", _http_adapter())
+            self.session.headers.update(_COMMON_HEADERS)
+            if self.api_key:
+                self.session.headers.update(
+                    {"X-MBX-APIKEY": str(self.api_key)}
+                )
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if signed and self.api_key:
+            self._sign(prepped)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params=None):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params=None, signed=False):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            self.session.headers.update(_COMMON_HEADERS)
+            if self.api_key:
+                self.session.headers.update(
+                    {"X-MBX-APIKEY": str(self.api_key)}
+                )
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if signed and self.api_key:
+            self._sign(prepped)
+
+        if self._semaphore is None:
+            # Created lazily, within the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            async with self._semaphore:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class BinanceDEX:
     '''Wrapper for the Binance DEX REST API
 
@@ -1070,7 +1481,12 @@ class BinanceDEX:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        max_concurrency: int = 20
+            Maximum requests in flight per instance (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -1104,200 +1520,219 @@ class BinanceDEX:
         "transactions_GET": "/api/v1/transactions",
         "transactions_in_block_GET": "/api/v1/transactions-in-block/",
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
+    # Endpoints with path parameters, function_name -> endpoint builder
+    _ENDPOINT_BUILDERS = {
+        "account_GET": lambda e, address, **_: f"{e}{address}",
+        "account_sequence_GET":
+            lambda e, address, **_: f"{e}{address}/sequence",
+        "transaction_GET": lambda e, _hash, **_: f"{e}{_hash}",
+        "orders_id_GET": lambda e, order_id, **_: f"{e}{order_id}",
+    }
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        def _set_endpoint(address=None, _hash=None,
-                          order_id=None, body=None, **kwargs):
-            _endpoint = endpoint
-            if function_name == "account_GET":
-                _endpoint = endpoint + str(address)
-            elif function_name == "account_sequence_GET":
-                _endpoint = endpoint + str(address) + "/sequence"
-            elif function_name == "transactions_GET":
-                _endpoint = endpoint + str(_hash)
-            elif function_name == "transaction_json_GET":
-                _endpoint = endpoint + str(_hash)
-            elif function_name == "orders_id_GET":
-                _endpoint = endpoint + str(order_id)
-
-            return _endpoint
-
-        if not self.asynchronous:
-            def _endpoint_request(self, address=None, _hash=None,
-                                  order_id=None, body=None, **kwargs):
-                _endpoint = _set_endpoint(
-                    address=address, _hash=_hash,
-                    order_id=order_id, body=body, kwargs=kwargs
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        build = cls._ENDPOINT_BUILDERS.get(function_name)
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
+
+        def _endpoint_request(self, address=None, _hash=None,
+                              order_id=None, body=None, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            if build:
+                url = build(
+                    url, address=address, _hash=_hash, order_id=order_id
                 )
-                response = self._request(_endpoint, verb, kwargs, body)
-                return response
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, kwargs, body)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+            return self._request(url, verb, kwargs, body)
 
-        else:
-            async def _endpoint_request(self, address=None, _hash=None,
-                                        order_id=None, body=None, **kwargs):
-                _endpoint = _set_endpoint(
-                    address=address, _hash=_hash,
-                    order_id=order_id, body=body, kwargs=kwargs
-                )
-                response = await self._request_async(
-                    _endpoint, verb, kwargs, body
-                )
-                return response
-
-        setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  request_timeout: int = 10, max_retries: int = 0,
-                 retry_time: int = 3, cache_expire: int = 0):
+                 retry_time: int = 3, cache_expire: int = 0,
+                 max_backoff: int = 60, max_concurrency: int = 20):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
 
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
-
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
-
-            self._create_class_function(function_name, endpoint, verb)
-
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
 
     def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            if len(self._prepared) >= 1024:
+                # Bound the templates of urls built from arguments
+                self._prepared.clear()
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
+
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-        return endpoint_methods
+        return prepped
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
 
             # Handle cache
             if not self.asynchronous:
+                ob = response_object.from_cache
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params, body):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params, body)
-
+    def _request(self, url, verb, params, body):
         # Create session
         if not self.session:
             cache_filename = "binance_dex_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
+            filename = os.path.join(_CACHE_DIR, cache_filename)
+            from requests_cache.core import CachedSession
             self.session = CachedSession(
                 cache_name=filename,
                 backend="sqlite",
                 expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
+                allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                fast_save=True
             )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
-            self.session.headers.update({"Content-Type": "text/plain"})
+            # WAL journal, persisted in the cache file
+            with self.session.cache.responses.connection(True) as con:
+                con.execute("PRAGMA journal_mode=WAL")
+            if self.cache_expire:
+                _schedule_cleanup(self.session.cache, self.cache_expire)
+            # Keep-alive pool shared across wrappers
+            self.session.mount("https://", _http_adapter())
+            self.session.headers.update(_BINANCE_DEX_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        prepped.body = body if body else prepped.body
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if body:
+            prepped.body = body
+            prepped.prepare_content_length(body)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params=None, body=None):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params=None, body=None):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
-            self.session.headers.update({"Content-Type": "text/plain"})
+            self.session.headers.update(_BINANCE_DEX_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        prepped.body = body if body else prepped.body
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if body:
+            prepped.body = body
+            prepped.prepare_content_length(body)
+
+        if self._semaphore is None:
+            # Created lazily, within the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            async with self._semaphore:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class Bitfinex:
     '''Wrapper for the Bitfinex REST API
 
@@ -1309,11 +1744,20 @@ class Bitfinex:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        rate_limit: tuple = (90, 60)
+            Requests allowed per period (seconds), paced client-side.
+        max_concurrency: int = 32
+            Upper bound of the adaptive requests in flight (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
             How long results will be cached.
+        cache_in_memory: bool = False
+            Cache in memory (per session) instead of a sqlite file.
 
     For more details, see: https://docs.bitfinex.com/v2/docs
     '''
@@ -1378,8 +1822,8 @@ class Bitfinex:
         "stats_GET": f"{_API_Pub}/v2/stats1",
         "candles_GET": f"{_API_Pub}/v2/candles/trade",
         # Calculation endpoints
-        "foreign_exchange_rate_POST": "/v2/calc/fx",
-        "market_average_price_POST": "{API}/v2/calc/trade/avg",
+        "foreign_exchange_rate_POST": f"{_API_Pub}/v2/calc/fx",
+        "market_average_price_POST": f"{_API_Pub}/v2/calc/trade/avg",
         # Private endpoints
         "alert_delete_POST": f"{_API}/v2/auth/w/alert/price",
         "alert_list_POST": f"{_API}/v2/auth/r/alerts",
@@ -1411,303 +1855,391 @@ class Bitfinex:
         "wallets_POST": f"{_API}/v2/auth/r/wallets",
         "wallets_history_POST": f"{_API}/v2/auth/r/wallets/hist"
     }
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
+    # Requests per period (seconds), REST
+    _RATE_LIMIT = (90, 60)
+    # Endpoints built from arguments, function_name ->
+    # f(endpoint, params, body, **arguments) -> (endpoint, params, body)
+    _ENDPOINT_BUILDERS = {
+        **dict.fromkeys(
+            ("v1_ticker_GET", "v1_stats_GET", "v1_orderbook_GET",
+             "v1_trades_GET", "ticker_GET", "funding_offers_POST",
+             "funding_loans_POST", "funding_credits_POST",
+             "funding_info_POST"),
+            lambda e, p, b, symbol, **_: (f"{e}{symbol}", p, b)
+        ),
+        **dict.fromkeys(
+            ("v1_fundingbook_GET", "v1_lends_GET"),
+            lambda e, p, b, currency, **_: (f"{e}{currency}", p, b)
+        ),
+        **dict.fromkeys(
+            ("foreign_exchange_rate_POST", "positions_history_POST",
+             "alert_set_POST", "calculate_available_balance_POST"),
+            lambda e, p, b, **_: (e, {}, dict(p))
+        ),
+        **dict.fromkeys(
+            ("orders_history_POST", "trades_POST",
+             "funding_offers_history_POST", "funding_loans_history_POST",
+             "funding_credits_history_POST", "funding_trades_POST",
+             "ledgers_POST"),
+            lambda e, p, b, symbol, **_: (
+                e + (f"/{symbol}/hist" if symbol else "/hist"), p, b
+            )
+        ),
+        "trades_GET": lambda e, p, b, symbol, **_: (f"{e}{symbol}/hist", p, b),
+        "orderbook_GET": lambda e, p, b, symbol, precision, **_: (
+            f"{e}{symbol}/{precision}", p, b
+        ),
+        "stats_GET": lambda e, p, b, key, size, symbol, section, **_: (
+            f"{e}/{key}:{size}:{symbol}/{section}", p, b
+        ),
+        "candles_GET": lambda e, p, b, timeframe, symbol, section, **_: (
+            f"{e}:{timeframe}:{symbol}/{section}", p, b
+        ),
+        "wallets_history_POST": lambda e, p, b, end, **_: (e, p, dict(end)),
+        "positions_audit_POST": lambda e, p, b, ids, **_: (e, p, {"id": ids}),
+        "order_trades_POST": lambda e, p, b, symbol, order_id, **_: (
+            f"{e}/{symbol}:{order_id}/trades", p, b
+        ),
+        "margin_info_POST": lambda e, p, b, key, **_: (f"{e}{key}", p, b),
+        "wallet_movements_POST": lambda e, p, b, currency, **_: (
+            e + (f"/{currency}/hist" if currency else "/hist"), p, b
+        ),
+        "alert_delete_POST": lambda e, p, b, symbol, price, **_: (
+            f"{e}:{symbol}:{price}/del", p, b
+        ),
+        "user_settings_read_POST":
+            lambda e, p, b, keys, **_: (e, p, {"keys": keys}),
+        **dict.fromkeys(
+            ("user_settings_write_POST", "user_settings_delete_POST"),
+            lambda e, p, b, settings, **_: (e, p, {"settings": settings})
+        ),
+    }
 
-    def _create_class_function(self, function_name, endpoint, verb):
-        def _set_endpoint(symbol=None, precision=None,
-                          key=None, size=None, section=None,
-                          end=None, timeframe=None,
-                          order_id=None, currency=None,
-                          price=None, keys=None, ids=None,
-                          body=None, settings=None, **kwargs):
-            params = {}
-            params.update(kwargs)
-            _endpoint = endpoint
-            # API V1
-            if function_name == "v1_ticker_GET":
-                _endpoint = f"{endpoint}{symbol}"
-            elif function_name == "v1_stats_GET":
-                _endpoint = f"{endpoint}{symbol}"
-            elif function_name == "v1_fundingbook_GET":
-                _endpoint = f"{endpoint}{currency}"
-            elif function_name == "v1_orderbook_GET":
-                _endpoint = f"{endpoint}{symbol}"
-            elif function_name == "v1_trades_GET":
-                _endpoint = f"{endpoint}{symbol}"
-            elif function_name == "v1_lends_GET":
-                _endpoint = f"{endpoint}{currency}"
-            # API V2
-            elif function_name == "trades_GET":
-                _endpoint = endpoint + str(symbol) + "/hist"
-            elif function_name == "orderbook_GET":
-                _endpoint = endpoint + str(symbol) + str(precision)
-            elif function_name == "stats_GET":
-                _endpoint = f"{endpoint}/{key}:{size}:{symbol}/{section}"
-            elif function_name == "candles_GET":
-                _endpoint = f"{endpoint}:{timeframe}:{symbol}/{section}"
-            elif function_name == "wallets_history_POST":
-                body = {}
-                body.update(end)
-            elif function_name == "positions_audit_POST":
-                body = {"id": ids}
-            elif function_name == "order_trades_POST":
-                _endpoint = f"{endpoint}/{symbol}:{order_id}/trades"
-            elif function_name == "margin_info_POST":
-                _endpoint = endpoint + str(key)
-            elif function_name == "wallet_movements_POST":
-                endpt_2 = f"/{currency}/hist" if currency else "/hist"
-                _endpoint = endpoint + endpt_2
-            elif function_name == "alert_delete_POST":
-                _endpoint = endpoint + f":{symbol}:{price}/del"
-            elif function_name == "user_settings_read_POST":
-                body = {"keys": keys}
-            elif function_name == "user_settings_write_POST":
-                body = {"settings": settings}
-            elif function_name == "user_settings_delete_POST":
-                body = {"settings": settings}
-            elif (function_name == "ticker_GET"
-                    or function_name == "funding_offers_POST"
-                    or function_name == "funding_loans_POST"
-                    or function_name == "funding_credits_POST"
-                    or function_name == "funding_info_POST"
-                    or function_name == "funding_loans_POST"):
-                _endpoint = endpoint + str(symbol)
-            elif (function_name == "foreign_exchange_rate_POST"
-                    or function_name == "positions_history_POST"
-                    or function_name == "alert_set_POST"
-                    or function_name == "calculate_available_balance_POST"
-                    or function_name == "positions_history_POST"):
-                params = {}
-                body = {}
-                body.update(kwargs)
-            elif (function_name == "orders_history_POST"
-                    or function_name == "trades_POST"
-                    or function_name == "funding_offers_history_POST"
-                    or function_name == "funding_loans_history_POST"
-                    or function_name == "funding_credits_history_POST"
-                    or function_name == "funding_trades_POST"
-                    or function_name == "ledgers_POST"):
-                endpoint_2 = f"/{symbol}/hist" if symbol else "/hist"
-                _endpoint = endpoint + endpoint_2
-
-            return (_endpoint, params, body)
-
-        if not self.asynchronous:
-            def _endpoint_request(self, symbol=None, precision=None,
-                                  key=None, size=None, section=None,
-                                  end=None, timeframe=None,
-                                  order_id=None, currency=None,
-                                  price=None, keys=None, ids=None,
-                                  body=None, settings=None, **kwargs):
-                _endpoint, params, body = _set_endpoint(
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        build = cls._ENDPOINT_BUILDERS.get(function_name)
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
+        # Authenticated: v2 "/auth/" and v1 POST endpoints
+        signed = "/auth/" in endpoint \
+            or ("/v1/" in endpoint and verb == "POST")
+
+        def _endpoint_request(self, symbol=None, precision=None, key=None,
+                              size=None, section=None, end=None,
+                              timeframe=None, order_id=None, currency=None,
+                              price=None, keys=None, ids=None, body=None,
+                              settings=None, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            params = kwargs
+            if build:
+                url, params, body = build(
+                    url, params, body,
                     symbol=symbol, precision=precision,
                     key=key, size=size, section=section,
                     end=end, timeframe=timeframe,
                     order_id=order_id, currency=currency,
                     price=price, keys=keys, ids=ids,
-                    body=body, settings=settings, kwargs=kwargs
+                    settings=settings
                 )
-                response = self._request(_endpoint, verb, params, body)
-                return response
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(url, verb, params, body, signed)
 
-            setattr(self.__class__, function_name, _endpoint_request)
+            return self._request(url, verb, params, body, signed)
 
-        else:
-            async def _endpoint_request(self, symbol=None, precision=None,
-                                        key=None, size=None, section=None,
-                                        end=None, timeframe=None,
-                                        order_id=None, currency=None,
-                                        price=None, keys=None, ids=None,
-                                        body=None, settings=None, **kwargs):
-                _endpoint, params, body = _set_endpoint(
-                    symbol=symbol, precision=precision,
-                    key=key, size=size, section=section,
-                    end=end, timeframe=timeframe,
-                    order_id=order_id, currency=currency,
-                    price=price, keys=keys, ids=ids,
-                    body=body, settings=settings, kwargs=kwargs
-                )
-                response = await self._request_async(
-                    _endpoint, verb, params, body
-                )
-                return response
-
-            setattr(self.__class__, function_name, _endpoint_request)
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, api_secret: str = None,
                  request_timeout: int = 10, max_retries: int = 0,
-                 retry_time: int = 3, cache_expire: int = 0):
+                 retry_time: int = 3, cache_expire: int = 0,
+                 cache_in_memory: bool = False,
+                 max_backoff: int = 60, rate_limit: tuple = None,
+                 max_concurrency: int = 32):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed once, copied per signature
+        self._hmac_template = hmac.new(
+            api_secret.encode("utf-8"), digestmod=sha384
+        ) if api_secret else None
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
+        self.cache_in_memory = cache_in_memory
 
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._limiter = _AIMDLimiter(
+            limit=min(4, max_concurrency), max_limit=max_concurrency
+        ) if asynchronous else None
+        self._rate_limiter = _TokenBucket(*(rate_limit or self._RATE_LIMIT))
 
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
+    def __getfunctions__(self):
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def gather(self, *coros, concurrency: int = 64):
+        '''Await endpoint coroutines concurrently (async mode)
+
+        Params:
+            *coros: endpoint calls, e.g. wrapper.ticker_GET(symbol=...)
+            concurrency: int = 64
+                Maximum number of requests in flight.
+
+        Returns the results in the order of coros.
+        '''
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(_bounded(coro) for coro in coros))
+
+    @contextmanager
+    def bulk(self):
+        '''Context manager batching cache writes into a single commit
+        (sync mode, sqlite cache)
+        '''
+        if self.asynchronous or self.cache_in_memory:
+            yield
+            return
 
-            self._create_class_function(function_name, endpoint, verb)
+        if not self.session:
+            self._create_session()
 
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        # Responses only: both tables share the file (a single writer)
+        responses = self.session.cache.responses
+        # fast_save can't set its pragma within the pending transaction
+        fast_save, responses.fast_save = responses.fast_save, False
+        try:
+            with responses.bulk_commit():
+                yield
+        finally:
+            responses.fast_save = fast_save
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            if len(self._prepared) >= 1024:
+                # Bound the templates of urls built from arguments
+                self._prepared.clear()
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
 
-    def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-        return endpoint_methods
+        return prepped
 
     def _set_auth_headers(self, prepped):
         '''Set authentication headers on a preppared request'''
-        parsed_url = urlparse(prepped.url)
-        path = parsed_url.path
-        path = "?".join([path, parsed_url.query]) if parsed_url.query else path
         expires = int(time() + 5000)
-        data = prepped.body or ""
-
-        message = "/api/" + path + str(expires) + data
-        signature = hmac.new(
-            key=self.api_secret.encode("utf-8"),
-            msg=message.encode("utf-8"),
-            digestmod=sha384
-        ).hexdigest()
-
-        prepped.headers.update({"bfx-apikey": self.api_key})
-        prepped.headers.update({"bfx-nonce": str(expires)})
-        prepped.headers.update({"bfx-signature": str(signature)})
+        data = prepped.body or b""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        message = bytearray(b"/api")
+        message += prepped.path_url.encode("ascii")
+        message += str(expires).encode("ascii")
+        message += data
+        h = self._hmac_template.copy()
+        h.update(message)
+        signature = h.hexdigest()
+
+        prepped.headers.update({
+            "bfx-apikey": self.api_key,
+            "bfx-nonce": str(expires),
+            "bfx-signature": signature
+        })
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
             response = {"response": response}
 
-            # Handle cache
+            # Handle cache (nothing is ever cached with cache_expire=0)
             if not self.asynchronous:
-                if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [
-                        dict(item, **{"cached": ob}) for item in response
-                    ]
-
-                if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                # Skip the from_cache lookup when caching is off
+                response["cached"] = (
+                    response_object.from_cache if self.cache_expire else False
+                )
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params, body):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params, body)
-
-        # Create session
-        if not self.session:
+    def _create_session(self):
+        '''Create the cached (sync) session'''
+        from requests_cache.core import CachedSession
+        if self.cache_in_memory:
+            # Nothing written to disk
+            self.session = CachedSession(
+                backend="memory",
+                expire_after=self.cache_expire,
+                allowable_methods=("GET", "POST", "PUT", "DELETE")
+            )
+        else:
             cache_filename = "bitfinex_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
+            filename = os.path.join(_CACHE_DIR, cache_filename)
             self.session = CachedSession(
                 cache_name=filename,
                 backend="sqlite",
                 expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
+                allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                fast_save=True
             )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            # WAL journal, persisted in the cache file
+            with self.session.cache.responses.connection(True) as con:
+                con.execute("PRAGMA journal_mode=WAL")
+        if self.cache_expire:
+            _schedule_cleanup(self.session.cache, self.cache_expire)
+        # Keep-alive pool shared across wrappers
+        self.session.mount("https://", _http_adapter())
+        self.session.headers.update(_COMMON_HEADERS)
+
+    def _request(self, url, verb, params, body, signed=False):
+        # Create session
+        if not self.session:
+            self._create_session()
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        prepped.body = body if body else prepped.body
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if isinstance(body, (dict, list)):
+            # Serialized once, reused (and signed) by every attempt
+            body = _json_dumps(body)
+            prepped.headers["Content-Type"] = "application/json"
+        if body:
+            prepped.body = body
+            prepped.prepare_content_length(body)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            if signed and self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            # Cache hits never reach the exchange: no token taken
+            cache = self.session.cache
+            hit = bool(self.cache_expire) and cache.has_key(
+                cache.create_key(prepped)
+            )
+            if not hit:
+                self._rate_limiter.acquire()
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            if hit and not response_object.from_cache:
+                # Expired entry, fetched again: charged afterwards
+                self._rate_limiter.acquire()
+            self._rate_limiter.update(response_object)
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params=None, body=None):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params, body)
-
+    async def _request_async(self, url, verb, params=None, body=None,
+                             signed=False):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            self.session.headers.update(_COMMON_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        prepped.body = body if body else prepped.body
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+        if isinstance(body, (dict, list)):
+            # Serialized once, reused (and signed) by every attempt
+            body = _json_dumps(body)
+            prepped.headers["Content-Type"] = "application/json"
+        if body:
+            prepped.body = body
+            prepped.prepare_content_length(body)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            if signed and self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            await self._rate_limiter.acquire_async()
+            async with self._limiter:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            self._limiter.update(response_object)
+            self._rate_limiter.update(response_object)
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
 
+@_bind_endpoints
 class Deribit:
     '''Wrapper for the Deribit API
 
@@ -1719,11 +2251,20 @@ class Deribit:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
+        rate_limit: tuple = (20, 1)
+            Requests allowed per period (seconds), paced client-side.
+        max_concurrency: int = 32
+            Upper bound of the adaptive requests in flight (async mode).
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
             How long results will be cached.
+        cache_in_memory: bool = False
+            Cache in memory (per session) instead of a sqlite file.
 
     To alternate between mainnet & testnet:
         Deribit.BASE_URL = "https://www.deribit.com/api/v2"
@@ -1824,82 +2365,158 @@ class Deribit:
         "submit_transfer_to_user_GET": "/private/submit_transfer_to_user",
         "wallet_withdraw_GET": "/private/withdraw"
     }
-
-    def _create_class_function(self, function_name, endpoint, verb):
-        if not self.asynchronous:
-            def _endpoint_request(self, **kwargs):
-                response = self._request(endpoint, verb, params=kwargs)
-                return response
-
-            setattr(self.__class__, function_name, _endpoint_request)
-
-        else:
-            async def _endpoint_request(self, **kwargs):
-                response = await self._request_async(
-                    endpoint, verb, params=kwargs
+    _PUBLIC_ENDPOINT_NAMES = tuple(sorted(_FUNCTIONS_ENDPOINTS))
+    # Requests per period (seconds), non-matching engine
+    _RATE_LIMIT = (20, 1)
+
+    @classmethod
+    def _create_class_function(cls, function_name, endpoint, verb):
+        base_url = cls.BASE_URL
+        full_url = base_url + endpoint
+        signed = endpoint.startswith("/private/")
+
+        def _endpoint_request(self, **kwargs):
+            url = full_url if self.BASE_URL is base_url \
+                else self.BASE_URL + endpoint
+            if self.asynchronous:
+                # Coroutine, awaited by the caller
+                return self._request_async(
+                    url, verb, params=kwargs, signed=signed
                 )
-                return response
 
-            setattr(self.__class__, function_name, _endpoint_request)
+            return self._request(url, verb, params=kwargs, signed=signed)
+
+        setattr(cls, function_name, _endpoint_request)
 
     def __init__(self, asynchronous: bool = False,
                  api_key: str = None, api_secret: str = None,
                  request_timeout: int = 10, max_retries: int = 0,
-                 retry_time: int = 3, cache_expire: int = 0):
+                 retry_time: int = 3, cache_expire: int = 0,
+                 cache_in_memory: bool = False,
+                 max_backoff: int = 60, rate_limit: tuple = None,
+                 max_concurrency: int = 32):
         # Set logger
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
 
         # Set session & keys
         self.asynchronous = asynchronous
         self.session = None
+        self._prepared = {}
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed once, copied per signature
+        self._hmac_template = hmac.new(
+            api_secret.encode("utf-8"), digestmod=sha256
+        ) if api_secret else None
+        # Nonces: unique per process (pid), shared counter across instances
+        self._nonce_prefix = f"{os.getpid():x}"
         self.request_timeout = request_timeout
         self.cache_expire = cache_expire
+        self.cache_in_memory = cache_in_memory
 
         # Set retries
         self.max_retries = max_retries
         self.retry_time = retry_time
-        self.retries = 0
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self._limiter = _AIMDLimiter(
+            limit=min(4, max_concurrency), max_limit=max_concurrency
+        ) if asynchronous else None
+        self._rate_limiter = _TokenBucket(*(rate_limit or self._RATE_LIMIT))
 
-        # Create class functions
-        for function_name in self._FUNCTIONS_ENDPOINTS.keys():
-            endpoint = self._FUNCTIONS_ENDPOINTS[function_name]
-            pattern = re.compile(r"(GET|POST|PUT|DELETE)$")
-            matches = pattern.finditer(function_name)
-            for match in matches:
-                verb = match[0]
+    def __getfunctions__(self):
+        return list(self._PUBLIC_ENDPOINT_NAMES)
+
+    def close(self):
+        '''Close the session (sync mode), the shared pool stays open'''
+        if self.session:
+            self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def close_async(self):
+        '''Close the session, releasing pooled connections (async mode)'''
+        if self.session:
+            await self.session.close()
+            self.session = None
+            self._prepared.clear()
+
+    async def gather(self, *coros, concurrency: int = 64):
+        '''Await endpoint coroutines concurrently (async mode)
+
+        Params:
+            *coros: endpoint calls, e.g. wrapper.ticker_GET(symbol=...)
+            concurrency: int = 64
+                Maximum number of requests in flight.
+
+        Returns the results in the order of coros.
+        '''
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(_bounded(coro) for coro in coros))
+
+    @contextmanager
+    def bulk(self):
+        '''Context manager batching cache writes into a single commit
+        (sync mode, sqlite cache)
+        '''
+        if self.asynchronous or self.cache_in_memory:
+            yield
+            return
 
-            self._create_class_function(function_name, endpoint, verb)
+        if not self.session:
+            self._create_session()
 
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
+        # Responses only: both tables share the file (a single writer)
+        responses = self.session.cache.responses
+        # fast_save can't set its pragma within the pending transaction
+        fast_save, responses.fast_save = responses.fast_save, False
+        try:
+            with responses.bulk_commit():
+                yield
+        finally:
+            responses.fast_save = fast_save
+
+    def _prepare(self, url, verb, params):
+        '''Prepared request, copied from a per (url, verb) template'''
+        template = self._prepared.get((url, verb))
+        if template is None:
+            if len(self._prepared) >= 1024:
+                # Bound the templates of urls built from arguments
+                self._prepared.clear()
+            template = self.session.prepare_request(
+                Request(method=verb, url=url)
+            )
+            self._prepared[(url, verb)] = template
 
-    def __getfunctions__(self):
-        endpoint_methods = []
-        for f in getmembers(self, ismethod):
-            if not f[0].startswith("_"):
-                endpoint_methods.append(f[0])
+        prepped = template.copy()
+        if params:
+            prepped.prepare_url(url, params)
 
-        return endpoint_methods
+        return prepped
 
     def _set_auth_headers(self, prepped):
         '''Set authentication headers on a preppared request'''
-        verb = prepped.method
-        parsed_url = urlparse(prepped.url)
-        path = parsed_url.path
-        path = "?".join([path, parsed_url.query]) if parsed_url.query else path
-        nonce = uuid4().hex
-        data = prepped.body or ""
+        nonce = f"{self._nonce_prefix}{next(_DERIBIT_NONCES):x}"
+        data = prepped.body or b""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
 
         timestamp = int(time() * 1000)
-        message = f"{timestamp}\n{nonce}\n{verb}\n{path}\n{data}\n"
-        signature = hmac.new(
-            key=self.api_secret.encode("utf-8"),
-            msg=message.encode("utf-8"),
-            digestmod=sha256
-        ).hexdigest()
+        message = b"\n".join((
+            str(timestamp).encode("ascii"), nonce.encode("ascii"),
+            prepped.method.encode("ascii"),
+            prepped.path_url.encode("ascii"), data, b""
+        ))
+        h = self._hmac_template.copy()
+        h.update(message)
+        signature = h.hexdigest()
 
         auth = f"deri-hmac-sha256 id={self.api_key},ts={timestamp}," \
                f"nonce={nonce},sig={signature}"
@@ -1907,109 +2524,145 @@ class Deribit:
 
     def _handle_response(self, response_object):
         '''Handle response, error'''
+        status_code = response_object.status_code
+        if status_code >= 400:
+            self.logger.info(
+                "Exception: HTTP %s for url: %s",
+                status_code, response_object.url
+            )
+            if status_code in _NO_RETRY_STATUSES:
+                # No retries (Bad request, Denied, Not found, Rate limit...)
+                return response_object.text
+
+            return None
+
+        if not response_object.content:
+            # Empty body (retried)
+            return None
+
         response = None
         try:
-            # raise Exception on non [200] response
-            response_object.raise_for_status()
-
             # Handle response
-            response = json.loads(response_object.text)
+            response = _json_loads(response_object.content)
 
-            # Cache handling
+            # Cache handling (nothing is ever cached with cache_expire=0)
             if not self.asynchronous:
+                # Skip the from_cache lookup when caching is off
+                ob = response_object.from_cache if self.cache_expire else False
                 if isinstance(response, list):
-                    ob = response_object.from_cache
-                    response = [dict(i, **{"cached": ob}) for i in response]
+                    for item in response:
+                        if isinstance(item, dict):
+                            item["cached"] = ob
 
                 if isinstance(response, dict):
-                    response["cached"] = response_object.from_cache
+                    response["cached"] = ob
 
         except Exception as e:
-            self.logger.info("Exception: {}".format(e))
-            if response_object.status_code in (400, 401, 403, 404, 429, 500):
-                # No retries (Bad request, Denied, Not found, Rate limit...)
-                response = response_object.text
+            self.logger.info("Exception: %s", e)
 
         return response
 
-    def _request(self, endpoint, verb, params):
-        def retry():
-            sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return self._request(endpoint, verb, params)
-
-        # Create session
-        if not self.session:
+    def _create_session(self):
+        '''Create the cached (sync) session'''
+        from requests_cache.core import CachedSession
+        if self.cache_in_memory:
+            # Nothing written to disk
+            self.session = CachedSession(
+                backend="memory",
+                expire_after=self.cache_expire,
+                allowable_methods=("GET", "POST", "PUT", "DELETE")
+            )
+        else:
             cache_filename = "deribit_cache"
-            filename = os.path.join(tempfile.gettempdir(), cache_filename)
+            filename = os.path.join(_CACHE_DIR, cache_filename)
             self.session = CachedSession(
                 cache_name=filename,
                 backend="sqlite",
                 expire_after=self.cache_expire,
-                allowable_methods=("GET", "POST", "PUT", "DELETE")
+                allowable_methods=("GET", "POST", "PUT", "DELETE"),
+                fast_save=True
             )
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            # WAL journal, persisted in the cache file
+            with self.session.cache.responses.connection(True) as con:
+                con.execute("PRAGMA journal_mode=WAL")
+        if self.cache_expire:
+            _schedule_cleanup(self.session.cache, self.cache_expire)
+        # Keep-alive pool shared across wrappers
+        self.session.mount("https://", _http_adapter())
+        self.session.headers.update(_COMMON_HEADERS)
+
+    def _request(self, url, verb, params, signed=False):
+        # Create session
+        if not self.session:
+            self._create_session()
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                sleep(_backoff(self.retry_time, attempt, self.max_backoff))
+            if signed and self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            # Cache hits never reach the exchange: no token taken
+            cache = self.session.cache
+            hit = bool(self.cache_expire) and cache.has_key(
+                cache.create_key(prepped)
+            )
+            if not hit:
+                self._rate_limiter.acquire()
+            response_object = self.session.send(
+                prepped, timeout=self.request_timeout
+            )
+            if hit and not response_object.from_cache:
+                # Expired entry, fetched again: charged afterwards
+                self._rate_limiter.acquire()
+            self._rate_limiter.update(response_object)
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
-    async def _request_async(self, endpoint, verb, params):
-        async def retry():
-            await asyncio.sleep(self.retry_time)
-            self.retries += 1
-            if self.retries >= self.max_retries:
-                raise Exception("Retry limit hit.")
-
-            return await self._request(endpoint, verb, params)
-
+    async def _request_async(self, url, verb, params, signed=False):
         # Create session
         if not self.session:
+            from requests_async import Session
             self.session = Session()
-            self.session.headers.update({"Accept": "application/json"})
-            self.session.headers.update({"Accept-Encoding": "gzip"})
+            self.session.headers.update(_COMMON_HEADERS)
 
         # Prepare request
-        url = self.BASE_URL + endpoint
-        req = Request(method=verb, url=url, params=params)
-        prepped = self.session.prepare_request(req)
-        if self.api_key:
-            self._set_auth_headers(prepped)
-
-        # Send request
-        self.logger.info("Sending request to: {}".format(prepped.url))
-        response_object = await self.session.send(
-            prepped, timeout=self.request_timeout
-        )
-        response = self._handle_response(response_object)
+        prepped = self._prepare(url, verb, params)
+
+        # Send request (retried on empty responses)
+        self.logger.info("Sending request to: %s", prepped.url)
+        for attempt in range(max(self.max_retries, 0) + 1):
+            if attempt:
+                await asyncio.sleep(
+                    _backoff(self.retry_time, attempt, self.max_backoff)
+                )
+            if signed and self.api_key:
+                # Signed per attempt (expires/nonce)
+                self._set_auth_headers(prepped)
+            await self._rate_limiter.acquire_async()
+            async with self._limiter:
+                response_object = await self.session.send(
+                    prepped, timeout=self.request_timeout
+                )
+            self._limiter.update(response_object)
+            self._rate_limiter.update(response_object)
+            response = self._handle_response(response_object)
+            if response is not None:
+                return response
 
-        # Retries (set to 0 on success)
         if self.max_retries > 0:
-            if not response:
-                retry()
-            self.retries = 0
+            raise Exception("Retry limit hit.")
 
         return response
 
@@ -2030,7 +2683,10 @@ class CryptoWrapper:
         max_retries: int = 0
             Number of retries on errors.
         retry_time: int = 3 (seconds)
-            Interval between retries.
+            Interval before the first retry, doubled on each retry.
+            Each wait is randomized between 0 and that interval.
+        max_backoff: int = 60 (seconds)
+            Maximum interval between retries.
 
     Not supported in async mode:
         cache_expire: int = 0 (seconds)
@@ -2048,11 +2704,9 @@ class CryptoWrapper:
 
     def __init__(self, api: str, **kwargs):
         self.logger = logging.getLogger(f"CryptoWrapper")
-        self.logger.debug(f"Initializing {self.__repr__()}")
+        self.logger.debug("Initializing %r", self)
+        _log_deletion(self, self.logger)
         if api not in self._API_WRAPPERS.keys():
             raise ValueError(f"API not supported: {api}")
 
         self.wrapper = self._API_WRAPPERS[api](**kwargs)
-
-    def __del__(self):
-        self.logger.debug(f"Deleting {self.__repr__()}")
@@ -1,20 +1,38 @@
 import logging
 import asyncio
 import json
-from time import time
+from time import time_ns
 
 from test.util.logger import setup_logger
 from src.cryptowrapper import CryptoWrapper
 
 
+# Static payload, serialized once
+BITMEX_BULK_ORDERS = json.dumps([
+    {"symbol": "XBTUSD", "orderQty": 250, "price": 1000},
+    {"symbol": "XBTUSD", "orderQty": 500, "price": 2500}
+])
+
+
 def main():
     setup_logger()
     logger = logging.getLogger(f"CryptoWrapper.{__name__}")
 
-    async def cmc_examples():
-        with open("bin/keys/cmc_k.txt", "r") as f:
-            cmc_key = f.read()
-
+    # Keys are read once, before the event loop starts
+    def read_key(filename):
+        with open(f"bin/keys/{filename}", "r") as f:
+            return f.read()
+
+    cmc_key = read_key("cmc_k.txt")
+    # cryptocompare_key = read_key("cryptocompare_k.txt")
+    # bitmex_key = read_key("bitmex_k.txt")
+    # bitmex_secret = read_key("bitmex_s.txt")
+    # binance_key = read_key("binance_k.txt")
+    # binance_secret = read_key("binance_s.txt")
+    # deribit_key = read_key("deribit_k.txt")
+    # deribit_secret = read_key("deribit_s.txt")
+
+    async def cmc_examples(cmc_key):
         cmc = CryptoWrapper(
             api="CMC",
             asynchronous=True,
@@ -31,10 +49,7 @@ def main():
         resp = await cmc_wrapper.cryptocurrency_info_GET(symbol="BTC")
         logger.info(resp["data"]["BTC"]["date_added"])
 
-    async def cryptocompare_examples():
-        with open("bin/keys/cryptocompare_k.txt", "r") as f:
-            cryptocompare_key = f.read()
-
+    async def cryptocompare_examples(cryptocompare_key):
         cryptocompare = CryptoWrapper(
             api="CryptoCompare",
             asynchronous=True,
@@ -54,17 +69,12 @@ def main():
         )
         logger.info(resp)
 
-    async def bitmex_examples():
-        # with open("bin/keys/bitmex_k.txt", "r") as f:
-        #     bitmex_key = f.read()
-        # with open("bin/keys/bitmex_s.txt", "r") as f:
-        #     bitmex_secret = f.read()
-
+    async def bitmex_examples(bitmex_key=None, bitmex_secret=None):
         bitmex = CryptoWrapper(
             api="BitMEX",
             asynchronous=True,
-            # api_key=bitmex_key,
-            # api_secret=bitmex_secret,
+            api_key=bitmex_key,
+            api_secret=bitmex_secret,
             max_retries=2
         )
         bitmex_wrapper = bitmex.wrapper
@@ -81,11 +91,7 @@ def main():
 
         async def example_2():
             resp = await bitmex_wrapper.order_bulk_POST(
-                orders=json.dumps([
-                        {"symbol": "XBTUSD", "orderQty": 250, "price": 1000},
-                        {"symbol": "XBTUSD", "orderQty": 500, "price": 2500}
-                    ]
-                ),
+                orders=BITMEX_BULK_ORDERS
             )
             logger.info(resp)
 
@@ -100,17 +106,12 @@ def main():
         # await example_2()
         # await example_3()
 
-    async def binance_examples():
-        # with open("bin/keys/binance_k.txt", "r") as f:
-        #     binance_key = f.read()
-        # with open("bin/keys/binance_s.txt", "r") as f:
-        #     binance_secret = f.read()
-
+    async def binance_examples(binance_key=None, binance_secret=None):
         binance = CryptoWrapper(
             api="Binance",
             asynchronous=True,
-            # api_key=binance_key,
-            # api_secret=binance_secret,
+            api_key=binance_key,
+            api_secret=binance_secret,
             max_retries=2
         )
         binance_wrapper = binance.wrapper
@@ -128,7 +129,7 @@ def main():
                 quantity=10,
                 price=0.009,
                 recvWindow=5000,
-                timestamp=int(time() * 1000 - 2000)
+                timestamp=time_ns() // 1_000_000 - 2000
             )
             logger.info(resp)
 
@@ -136,7 +137,7 @@ def main():
             resp = await binance_wrapper.user_wallet_deposit_address_GET(
                 asset="BTC",
                 recvWindow=5000,
-                timestamp=int(time() * 1000 - 2000)
+                timestamp=time_ns() // 1_000_000 - 2000
             )
             logger.info(resp)
 
@@ -177,17 +178,12 @@ def main():
         )
         logger.info(resp)
 
-    async def deribit_examples():
-        # with open("bin/keys/deribit_k.txt", "r") as f:
-        #     deribit_key = f.read()
-        # with open("bin/keys/deribit_s.txt", "r") as f:
-        #     deribit_secret = f.read()
-
+    async def deribit_examples(deribit_key=None, deribit_secret=None):
         deribit = CryptoWrapper(
             asynchronous=True,
             api="Deribit",
-            # api_key=deribit_key,
-            # api_secret=deribit_secret,
+            api_key=deribit_key,
+            api_secret=deribit_secret,
             cache_expire=0,
             max_retries=2
         )
@@ -224,25 +220,23 @@ def main():
         # await example_2()
         # await example_3()
 
-    loop = asyncio.get_event_loop()
-    try:
-        tasks = [
-            cmc_examples(),
-            # cryptocompare_examples(),
-            # bitmex_examples(),
-            # binance_examples(),
+    async def run_examples():
+        await asyncio.gather(
+            cmc_examples(cmc_key),
+            # cryptocompare_examples(cryptocompare_key),
+            # bitmex_examples(bitmex_key, bitmex_secret),
+            # binance_examples(binance_key, binance_secret),
             # binance_dex_examples(),
             # bitfinex_examples(),
-            # deribit_examples()
-        ]
-        loop.run_until_complete(asyncio.wait(tasks))
+            # deribit_examples(deribit_key, deribit_secret)
+        )
+
+    try:
+        asyncio.run(run_examples())
 
     except Exception as e:
         logger.info(f"Exception: {e}")
 
-    finally:
-        loop.close()
-
 
 if __name__ == "__main__":
     main()
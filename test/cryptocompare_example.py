@@ -1,81 +1,98 @@
 import asyncio
 import os
 import json
+import hashlib
 from time import time
-from inspect import getmembers, ismethod
+from operator import itemgetter
 
 from src.cryptowrapper import CryptoWrapper
 
+try:
+    # Optional, faster serialization straight to bytes
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
 
-DIR = os.path.dirname(__name__) + "bin/data/"
+
+# Output directory, relative to this file (not the working directory)
+DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "bin", "data"
+)
 CCOMPARE = CryptoWrapper(api="CryptoCompare", asynchronous=True)
 CC_WRAPPER = CCOMPARE.wrapper
 EXCHANGE = "CCCAGG"  # Exchange to get candles from. Def: "CCADD": CCompare Avg
+PAGE_CONCURRENCY = 8  # Max page requests in flight
 
 
-async def get_candles_daily(pair: list, aggregate: int = 1):
-    data = []
-    unix_init = int(time())
-    for _ in range(2):
-        # Collect 2000 candles
-        resp = await CC_WRAPPER.historical_daily_ohlcv_GET(
-            fsym=pair[0], tsym=pair[1], limit=2000, toTs=unix_init,  # unix
-            aggregate=aggregate, e=EXCHANGE
-        )
-        data.extend(resp["Data"])
-        unix_init -= 2000 * 60 * 60 * 24
-
-    with open(f"{DIR}{pair[0]}{pair[1]}_{aggregate}D.json", "w") as f:
-        # Sort candles & remove empty ones
-        data = [c for c in data if not c["close"] == 0]
-        data = sorted(data, key=lambda x: x["time"])
-        json.dump(data, f)
-
-
-async def get_candles_hourly(pair: list, aggregate: int = 1):
-    data = []
+async def fetch_pages(endpoint, pages: int, step: int, **params):
+    # Request pages concurrently, at most PAGE_CONCURRENCY at a time
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
     unix_init = int(time())
-    for _ in range(40):
-        # Collect 2000 candles
-        resp = await CC_WRAPPER.historical_hourly_ohlcv_GET(
-            fsym=pair[0], tsym=pair[1], limit=2000, toTs=unix_init,  # unix
-            aggregate=aggregate, e=EXCHANGE
-        )
-        data.extend(resp["Data"])
-        unix_init -= 2000 * 60 * 60
-
-    with open(f"{DIR}{pair[0]}{pair[1]}_{aggregate}h.json", "w") as f:
-        # Sort candles & remove empty ones
-        data = [c for c in data if not c["close"] == 0]
-        data = sorted(data, key=lambda x: x["time"])
-        json.dump(data, f)
-
 
-async def get_candles_minutes(pair: list, aggregate: int = 1):
-    data = []
-    unix_init = int(time())
-    for _ in range(40):
-        # Collect 2000 candles
-        resp = await CC_WRAPPER.historical_minute_ohlcv_GET(
-            fsym=pair[0], tsym=pair[1], limit=2000, toTs=unix_init,  # unix
-            aggregate=aggregate, e=EXCHANGE
-        )
-        data.extend(resp["Data"])
-        unix_init -= 2000 * 60
+    async def fetch(to_ts):
+        async with sem:
+            return await endpoint(toTs=to_ts, **params)
+
+    resps = await asyncio.gather(*(
+        fetch(unix_init - i * step) for i in range(pages)
+    ))
+    return [c for resp in resps for c in resp["Data"]]
+
+
+# Granularity: (endpoint, pages of 2000 candles, page step, file suffix)
+GRANULARITIES = {
+    "D": (CC_WRAPPER.historical_daily_ohlcv_GET, 2, 2000 * 60 * 60 * 24, "D"),
+    "H": (CC_WRAPPER.historical_hourly_ohlcv_GET, 40, 2000 * 60 * 60, "h"),
+    "M": (CC_WRAPPER.historical_minute_ohlcv_GET, 40, 2000 * 60, "min")
+}
+
+
+async def get_candles(pair: list, aggregate: int = 1, granularity="D"):
+    '''Collect candles & write them to DIR
+
+    Params:
+        pair: list, ex: ["BTC", "USD"]
+        aggregate: int = 1
+        granularity: str = "D"
+            "D" (daily), "H" (hourly) or "M" (minutes)
+    '''
+    endpoint, pages, step, suffix = GRANULARITIES[granularity]
+    data = await fetch_pages(
+        endpoint, pages, step,
+        fsym=pair[0], tsym=pair[1], limit=2000, aggregate=aggregate,
+        e=EXCHANGE
+    )
+
+    # Sort candles & remove empty ones, then write the encoded buffer
+    data = [c for c in data if c["close"]]
+    data.sort(key=itemgetter("time"))
+    payload = json_dumps(data)
+    filename = os.path.join(
+        DIR, f"{pair[0]}{pair[1]}_{aggregate}{suffix}.json"
+    )
+
+    # Skip the write if the candles are unchanged since the last run
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    try:
+        with open(f"{filename}.hash", "r") as f:
+            if f.read() == digest and os.path.exists(filename):
+                return
+    except FileNotFoundError:
+        pass
 
-    with open(f"{DIR}{pair[0]}{pair[1]}_{aggregate}min.json", "w") as f:
-        # Sort candles & remove empty ones
-        data = [c for c in data if not c["close"] == 0]
-        data = sorted(data, key=lambda x: x["time"])
-        json.dump(data, f)
+    with open(f"{filename}.tmp", "wb") as f:
+        f.write(payload)
+    os.replace(f"{filename}.tmp", filename)
+    with open(f"{filename}.hash", "w") as f:
+        f.write(digest)
 
 
 async def cryptocompare_query():
     'See https://min-api.cryptocompare.com/documentation'
     def print_functions():
-        for f in getmembers(CC_WRAPPER, ismethod):
-            if not f[0].startswith("_"):
-                print(f[0])
+        # Endpoint names, precomputed on the wrapper class
+        print("\n".join(CC_WRAPPER.__getfunctions__()))
 
     # Uncomment to print a list of available functions (endpoints)
     # print_functions()
@@ -88,29 +105,28 @@ async def cryptocompare_query():
     print(resp)
 
 
-if __name__ == "__main__":
-    loop = asyncio.get_event_loop()
-
-    # Declare the pair to collect candles for
-    pair = ["BTC", "USD"]
+async def run_examples(pair: list):
     try:
-        tasks = [
-            # get_candles_daily(pair, 1),
-            # get_candles_hourly(pair, 1),
-            # get_candles_minutes(pair, 1),
+        await asyncio.gather(
+            # get_candles(pair, 1, "D"),
+            # get_candles(pair, 1, "H"),
+            # get_candles(pair, 1, "M"),
             cryptocompare_query()
 
-            # get_candles_daily(pair, 1),
-            # get_candles_hourly(pair, 1),
-            # get_candles_hourly(pair, 4),
-            # get_candles_minutes(pair, 1),
-            # get_candles_minutes(pair, 5)
-            # get_candles_minutes(pair, 15)
-        ]
-        loop.run_until_complete(asyncio.wait(tasks))
-
-    except Exception:
-        raise
+            # get_candles(pair, 1, "D"),
+            # get_candles(pair, 1, "H"),
+            # get_candles(pair, 4, "H"),
+            # get_candles(pair, 1, "M"),
+            # get_candles(pair, 5, "M")
+            # get_candles(pair, 15, "M")
+        )
 
     finally:
-        loop.close()
+        # Release the pooled connections shared by all requests
+        await CC_WRAPPER.close_async()
+
+
+if __name__ == "__main__":
+    # Declare the pair to collect candles for
+    pair = ["BTC", "USD"]
+    asyncio.run(run_examples(pair))
@@ -1,11 +1,19 @@
 import logging
 import json
-from time import time
+from time import time_ns
+from concurrent.futures import ThreadPoolExecutor
 
 from src.cryptowrapper import CryptoWrapper
 from util.logger import setup_logger
 
 
+# Static payload, serialized once
+BITMEX_BULK_ORDERS = json.dumps([
+    {"symbol": "XBTUSD", "orderQty": 250, "price": 1000},
+    {"symbol": "XBTUSD", "orderQty": 500, "price": 2500}
+])
+
+
 def main():
     setup_logger()
     logger = logging.getLogger()
@@ -76,13 +84,7 @@ def main():
             logger.info(resp[0])
 
         def example_2():
-            resp = bitmex_wrapper.order_bulk_POST(
-                orders=json.dumps([
-                        {"symbol": "XBTUSD", "orderQty": 250, "price": 1000},
-                        {"symbol": "XBTUSD", "orderQty": 500, "price": 2500}
-                    ]
-                ),
-            )
+            resp = bitmex_wrapper.order_bulk_POST(orders=BITMEX_BULK_ORDERS)
             logger.info(resp)
 
         def example_3():
@@ -123,7 +125,7 @@ def main():
                 quantity=10,
                 price=0.009,
                 recvWindow=5000,
-                timestamp=int(time() * 1000 - 2000)
+                timestamp=time_ns() // 1_000_000 - 2000
             )
             logger.info(resp)
 
@@ -131,7 +133,7 @@ def main():
             resp = binance_wrapper.user_wallet_deposit_address_GET(
                 asset="BTC",
                 recvWindow=5000,
-                timestamp=int(time() * 1000 - 2000)
+                timestamp=time_ns() // 1_000_000 - 2000
             )
             logger.info(resp)
 
@@ -215,17 +217,24 @@ def main():
         # example_2()
         # example_3()
 
-    try:
-        cmc_examples()
-        # cryptocompare_examples()
-        # bitmex_examples()
-        # binance_examples()
-        # binance_dex_examples()
-        # bitfinex_examples()
-        # deribit_examples()
-
-    except Exception as e:
-        logger.info(f"Exception: {e}")
+    def run(examples):
+        # One exchange failing does not abort the others
+        try:
+            examples()
+        except Exception as e:
+            logger.info(f"Exception: {e}")
+
+    # Independent hosts, blocking on I/O: run the examples in threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(run, [
+            cmc_examples,
+            # cryptocompare_examples,
+            # bitmex_examples,
+            # binance_examples,
+            # binance_dex_examples,
+            # bitfinex_examples,
+            # deribit_examples
+        ]))
 
 
 if __name__ == "__main__":
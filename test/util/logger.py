@@ -1,9 +1,11 @@
 import logging
+import logging.handlers
 import os
 from time import strftime, gmtime
 
 
 LOGS_DIR = os.path.dirname(__file__) + "/../../bin/logs/"
+_DATE = strftime("%Y_%m_%d", gmtime())
 
 
 def setup_logger(filename="CryptoWrapper", logger=""):
@@ -14,6 +16,11 @@ def setup_logger(filename="CryptoWrapper", logger=""):
         logger: str = ""
     '''
     logger = logging.getLogger(logger)
+    if any(isinstance(h, logging.handlers.MemoryHandler)
+           for h in logger.handlers):
+        # Already set up, avoid duplicate handlers
+        return logger
+
     logger.setLevel(logging.INFO)
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(message)s")
     # logging.raiseExceptions = False
@@ -23,12 +30,15 @@ def setup_logger(filename="CryptoWrapper", logger=""):
     logger.addHandler(ch)
 
     # Logs stream to a file
-    date = strftime("%Y_%m_%d", gmtime())
     hdlr = logging.FileHandler(
-        f"{LOGS_DIR}/CryptoWrapper_{date}.log",
+        f"{LOGS_DIR}/CryptoWrapper_{_DATE}.log",
         encoding="utf-8"
     )
     hdlr.setFormatter(formatter)
-    logger.addHandler(hdlr)
+    # Buffer records, written in batches (or on error / exit)
+    mem = logging.handlers.MemoryHandler(
+        1024, flushLevel=logging.ERROR, target=hdlr
+    )
+    logger.addHandler(mem)
 
     return logger